@@ -14,16 +14,103 @@ MVP goals:
 from __future__ import annotations
 
 import argparse
+import contextlib
+import hashlib
+import io
 import json
+import math
+import mmap
 import os
+import re
+import shutil
+import stat
 import sys
-from typing import Any, Dict, List, Optional, Tuple
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 try:
     import yaml  # PyYAML
 except ImportError:
     yaml = None
 
+# Fastest available JSON backend; all of them accept bytes in loads(). The
+# stdlib module is always imported as the fallback for inputs the fast
+# backends reject (e.g. integers beyond 64 bits).
+try:
+    import orjson
+
+    _JSON_LOADS_BUFFER = True  # orjson parses straight from a memoryview
+
+    # orjson silently turns integers beyond 64 bits into floats; a run of 20+
+    # digits is the cheap (C-level) tell that stdlib json should parse instead.
+    _LONG_DIGITS = re.compile(rb"[0-9]{20,}")
+
+    def _json_loads(data: Any) -> Any:
+        if _LONG_DIGITS.search(data):
+            return json.loads(bytes(data))
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(bytes(data))
+
+    def _has_nonfinite(obj: Any) -> bool:
+        stack = [obj]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, float):
+                if not math.isfinite(node):
+                    return True
+            elif isinstance(node, dict):
+                stack.extend(node.values())
+            elif isinstance(node, (list, tuple)):
+                stack.extend(node)
+        return False
+
+    def _json_dumps(obj: Any) -> str:
+        try:
+            out = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return json.dumps(obj, ensure_ascii=False, indent=2)
+        # orjson writes NaN/Infinity as null; only walk the example when a null
+        # shows up, and let stdlib json render the original value
+        if b"null" in out and _has_nonfinite(obj):
+            return json.dumps(obj, ensure_ascii=False, indent=2)
+        return out.decode("utf-8")
+
+except ImportError:
+    try:
+        import ujson
+
+        _JSON_LOADS_BUFFER = False
+
+        def _json_loads(data: Any) -> Any:
+            try:
+                return ujson.loads(data)
+            except (ValueError, OverflowError):
+                return json.loads(data)
+
+        def _json_dumps(obj: Any) -> str:
+            try:
+                return ujson.dumps(obj, ensure_ascii=False, indent=2, escape_forward_slashes=False)
+            except (TypeError, OverflowError):
+                return json.dumps(obj, ensure_ascii=False, indent=2)
+
+    except ImportError:
+        _json_loads = json.loads
+        _JSON_LOADS_BUFFER = False
+
+        def _json_dumps(obj: Any) -> str:
+            return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+if yaml is not None:
+    try:
+        # libyaml-backed loader; much faster on large specs
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+
 
 def eprint(*args: Any) -> None:
     print(*args, file=sys.stderr)
@@ -33,112 +120,172 @@ def load_spec(path: str) -> Dict[str, Any]:
     if not os.path.exists(path):
         raise FileNotFoundError(f"Spec not found: {path}")
 
-    with open(path, "r", encoding="utf-8") as f:
-        raw = f.read()
+    is_json = path.lower().endswith(".json")
+    if not is_json and yaml is None:
+        raise RuntimeError("PyYAML is not installed. Add PyYAML>=6.0 to requirements.txt")
 
-    lower = path.lower()
-    if lower.endswith(".json"):
-        return json.loads(raw)
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+            # pipes/FIFOs can't be mapped (and report size 0); mmap refuses empty files
+            raw = f.read()
+            return _json_loads(raw) if is_json else yaml.load(raw, Loader=_YamlLoader)
+
+        # Map the file read-only so parsers read from the page cache instead of
+        # a full in-memory copy of the spec.
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if is_json:
+                if _JSON_LOADS_BUFFER:
+                    with memoryview(mm) as view:
+                        return _json_loads(view)
+                return _json_loads(mm[:])
+
+            # YAML (default): mmap is file-like, so the loader streams from it
+            return yaml.load(mm, Loader=_YamlLoader)
+        finally:
+            mm.close()
+
+
+_METHODS = frozenset({"get", "post", "put", "patch", "delete", "head", "options"})
 
-    # YAML (default)
-    if yaml is None:
-        raise RuntimeError("PyYAML is not installed. Add PyYAML>=6.0 to requirements.txt")
-    return yaml.safe_load(raw)
+
+def _validate(spec: Any) -> Dict[str, Any]:
+    """
+    One up-front pass over the parts of the spec the renderers walk. Returns a
+    shallow, normalized view in which aberrant values are coerced to empty
+    containers and path items only keep operation objects, so the hot paths
+    below need no isinstance checks. Operation objects are shared, not copied.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("Spec root must be a mapping")
+
+    info = spec.get("info")
+    servers = spec.get("servers")
+    components = spec.get("components")
+    schemes = components.get("securitySchemes") if isinstance(components, dict) else None
+    paths = spec.get("paths")
+
+    return {
+        "info": info if isinstance(info, dict) else {},
+        "servers": servers[:1] if isinstance(servers, list) and servers and isinstance(servers[0], dict) else [],
+        "components": {
+            "securitySchemes": {
+                name: scheme for name, scheme in schemes.items() if isinstance(scheme, dict)
+            }
+            if isinstance(schemes, dict)
+            else {}
+        },
+        "paths": {
+            path: {
+                method: op
+                for method, op in path_item.items()
+                if str(method).lower() in _METHODS and isinstance(op, dict)
+            }
+            for path, path_item in paths.items()
+            if isinstance(path_item, dict)
+        }
+        if isinstance(paths, dict)
+        else {},
+    }
 
 
 def first_server_url(spec: Dict[str, Any]) -> Optional[str]:
+    """
+    Expects a spec normalized by _validate().
+    """
     servers = spec.get("servers") or []
-    if servers and isinstance(servers, list) and isinstance(servers[0], dict):
-        return servers[0].get("url")
-    return None
+    return servers[0].get("url") if servers else None
 
 
 def detect_bearer_auth(spec: Dict[str, Any]) -> bool:
-    components = spec.get("components") or {}
-    sec = (components.get("securitySchemes") or {}) if isinstance(components, dict) else {}
-    if not isinstance(sec, dict):
-        return False
-
-    for _, scheme in sec.items():
-        if not isinstance(scheme, dict):
-            continue
+    """
+    Expects a spec normalized by _validate().
+    """
+    for scheme in spec["components"]["securitySchemes"].values():
         if scheme.get("type") == "http" and str(scheme.get("scheme", "")).lower() == "bearer":
             return True
     return False
 
 
-def collect_operations(spec: Dict[str, Any]) -> List[Tuple[str, str, Dict[str, Any]]]:
+def collect_operations(
+    spec: Dict[str, Any],
+) -> Tuple[List[str], List[str], List[Dict[str, Any]], List[str]]:
     """
-    Returns list of (method, path, operationObject)
+    Returns parallel lists (methods, paths, operationObjects, purposes) in spec
+    order. purposes holds the escaped summary-table text, so the summary pass
+    never touches the operation objects. Expects a spec normalized by _validate().
     """
-    paths = spec.get("paths") or {}
-    if not isinstance(paths, dict):
-        return []
+    methods: List[str] = []
+    op_paths: List[str] = []
+    ops: List[Dict[str, Any]] = []
+    purposes: List[str] = []
 
-    ops: List[Tuple[str, str, Dict[str, Any]]] = []
-    for path, path_item in paths.items():
-        if not isinstance(path_item, dict):
-            continue
+    for path, path_item in spec["paths"].items():
+        p = str(path)
         for method, op in path_item.items():
-            m = str(method).lower()
-            if m not in {"get", "post", "put", "patch", "delete", "head", "options"}:
-                continue
-            if isinstance(op, dict):
-                ops.append((m.upper(), str(path), op))
-    # stable sort: path then method
-    return sorted(ops, key=lambda t: (t[1], t[0]))
-
-
-def md_escape(text: str) -> str:
-    return text.replace("\n", " ").strip()
+            methods.append(str(method).upper())
+            op_paths.append(p)
+            ops.append(op)
+            purposes.append(md_escape(str(op.get("summary") or op.get("description") or "")))
+    return (methods, op_paths, ops, purposes)
 
 
-def md_h1(title: str) -> str:
-    return f"# {title}\n"
+_MD_ESCAPE = str.maketrans({"|": "\\|", "\n": " "})
 
 
-def md_h2(title: str) -> str:
-    return f"\n## {title}\n"
-
-
-def md_h3(title: str) -> str:
-    return f"\n### {title}\n"
+def md_escape(text: str) -> str:
+    """
+    Flattens text for a single Markdown line / table cell: newlines become
+    spaces and pipes are escaped.
+    """
+    if "|" not in text and "\n" not in text:
+        return text.strip()
+    return text.translate(_MD_ESCAPE).strip()
 
 
-def render_endpoint_summary(ops: List[Tuple[str, str, Dict[str, Any]]]) -> str:
-    out = []
-    out.append(md_h2("Endpoint summary"))
-    out.append("| Method | Path | Purpose |")
-    out.append("|---:|---|---|")
-    for method, path, op in ops:
-        purpose = md_escape(str(op.get("summary") or op.get("description") or ""))
-        out.append(f"| {method} | `{path}` | {purpose} |")
-    out.append("")
-    return "\n".join(out)
+def render_endpoint_summary(buf: TextIO, methods: List[str], paths: List[str], purposes: List[str]) -> None:
+    buf.write("\n## Endpoint summary\n\n")
+    buf.write("| Method | Path | Purpose |\n")
+    buf.write("|---:|---|---|\n")
+    write = buf.write
+    for method, path, purpose in zip(methods, paths, purposes):
+        write(f"| {method} | `{path}` | {purpose} |\n")
+    buf.write("\n")
 
 
-def render_auth_section(has_bearer: bool) -> str:
-    out = []
-    out.append(md_h2("Authentication"))
+def render_auth_section(buf: TextIO, has_bearer: bool) -> None:
+    buf.write("\n## Authentication\n\n")
     if has_bearer:
-        out.append("All requests require a bearer token:")
-        out.append("")
-        out.append("`Authorization: Bearer <token>`")
+        buf.write("All requests require a bearer token:\n\n")
+        buf.write("`Authorization: Bearer <token>`\n")
     else:
-        out.append("Authentication is not defined in this sample OpenAPI spec.")
-    out.append("")
-    return "\n".join(out)
+        buf.write("Authentication is not defined in this sample OpenAPI spec.\n")
+    buf.write("\n")
 
 
-def extract_json_example(content_obj: Dict[str, Any]) -> Optional[Any]:
+def extract_json_example(
+    content_obj: Dict[str, Any], memo: Optional[Dict[int, Any]] = None
+) -> Optional[Any]:
     """
     Attempts to find a JSON example:
     - content.application/json.example
     - content.application/json.examples.<name>.value
+
+    memo (one dict per render, keyed by id()) lets content objects shared via
+    YAML anchors/aliases be inspected only once.
     """
     if not isinstance(content_obj, dict):
         return None
+    if memo is None:
+        return _extract_json_example(content_obj)
+    key = id(content_obj)
+    if key not in memo:
+        memo[key] = _extract_json_example(content_obj)
+    return memo[key]
 
+
+def _extract_json_example(content_obj: Dict[str, Any]) -> Optional[Any]:
     app_json = content_obj.get("application/json")
     if not isinstance(app_json, dict):
         return None
@@ -149,21 +296,71 @@ def extract_json_example(content_obj: Dict[str, Any]) -> Optional[Any]:
     examples = app_json.get("examples")
     if isinstance(examples, dict) and examples:
         # take first
-        first_key = next(iter(examples.keys()))
-        ex = examples.get(first_key)
+        _, ex = next(iter(examples.items()))
         if isinstance(ex, dict) and "value" in ex:
             return ex.get("value")
 
     return None
 
 
-def extract_request_fields(op: Dict[str, Any]) -> Tuple[List[Dict[str, str]], bool]:
+def resolve_ref(
+    spec: Optional[Dict[str, Any]], node: Any, ref_cache: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    If node is a local {"$ref": "#/..."} object, returns the referenced subtree
+    (following chained refs). Anything else, including unresolvable refs, is
+    returned unchanged. ref_cache (one dict per render) makes each ref string
+    a single pointer walk; repeated uses of a shared schema are dict hits.
+    """
+    if spec is None:
+        return node
+    for _ in range(32):  # bail out of ref cycles
+        if not isinstance(node, dict):
+            return node
+        ref = node.get("$ref")
+        if not isinstance(ref, str):
+            return node
+        if ref_cache is None:
+            target = _resolve_pointer(spec, ref)
+        elif ref in ref_cache:
+            target = ref_cache[ref]
+        else:
+            target = ref_cache[ref] = _resolve_pointer(spec, ref)
+        if target is None:
+            return node
+        node = target
+    return node
+
+
+def _resolve_pointer(spec: Dict[str, Any], ref: str) -> Optional[Any]:
+    if not ref.startswith("#/"):
+        return None  # external refs are not supported
+    node: Any = spec
+    for part in ref[2:].split("/"):
+        part = part.replace("~1", "/").replace("~0", "~")
+        if isinstance(node, dict):
+            if part not in node:
+                return None
+            node = node[part]
+        elif isinstance(node, list) and part.isdecimal() and int(part) < len(node):
+            node = node[int(part)]
+        else:
+            return None
+    return node
+
+
+def extract_request_fields(
+    op: Dict[str, Any],
+    spec: Optional[Dict[str, Any]] = None,
+    ref_cache: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, str]], bool]:
     """
     Returns (fields, has_json_body)
     fields: list of {name,type,required,notes}
     MVP: supports application/json with schema type=object + properties + required
+    Local $refs (request body, schema, properties) are resolved against spec.
     """
-    rb = op.get("requestBody")
+    rb = resolve_ref(spec, op.get("requestBody"), ref_cache)
     if not isinstance(rb, dict):
         return ([], False)
 
@@ -175,7 +372,7 @@ def extract_request_fields(op: Dict[str, Any]) -> Tuple[List[Dict[str, str]], bo
     if not isinstance(app_json, dict):
         return ([], False)
 
-    schema = app_json.get("schema")
+    schema = resolve_ref(spec, app_json.get("schema"), ref_cache)
     if not isinstance(schema, dict):
         return ([], True)  # json body exists but unknown schema
 
@@ -185,161 +382,381 @@ def extract_request_fields(op: Dict[str, Any]) -> Tuple[List[Dict[str, str]], bo
     required = schema.get("required") or []
     if not isinstance(required, list):
         required = []
+    # set membership keeps wide schemas linear instead of props x required
+    required_names = {str(r) for r in required}
 
     props = schema.get("properties") or {}
     if not isinstance(props, dict):
         props = {}
 
-    fields: List[Dict[str, str]] = []
-    for field_name, field_schema in props.items():
+    # (optional?, name, index, row): plain tuple comparison gives "required first
+    # then alpha" without a key function; the index breaks ties before the dicts
+    decorated: List[Tuple[bool, str, int, Dict[str, str]]] = []
+    for i, (field_name, field_schema) in enumerate(props.items()):
+        field_schema = resolve_ref(spec, field_schema, ref_cache)
         if not isinstance(field_schema, dict):
             field_schema = {}
         ftype = str(field_schema.get("type") or "object")
-        notes = ""
-        if "description" in field_schema:
-            notes = md_escape(str(field_schema.get("description") or ""))
+        desc = field_schema.get("description")
+        notes = md_escape(str(desc)) if desc else ""
         example = field_schema.get("example")
         if example is not None:
-            notes = (notes + " " if notes else "") + f"Example: `{example}`"
-        fields.append(
-            {
-                "name": str(field_name),
-                "type": ftype,
-                "required": "yes" if field_name in required else "no",
-                "notes": notes,
-            }
+            notes = (notes + " " if notes else "") + f"Example: `{str(example).translate(_MD_ESCAPE)}`"
+        name = str(field_name)
+        is_required = name in required_names
+        decorated.append(
+            (
+                not is_required,
+                name,
+                i,
+                {
+                    "name": name,
+                    "type": ftype,
+                    "required": "yes" if is_required else "no",
+                    "notes": notes,
+                },
+            )
         )
 
-    # stable order: required first then alpha
-    fields.sort(key=lambda r: (r["required"] != "yes", r["name"]))
-    return (fields, True)
+    decorated.sort()
+    return ([row for _, _, _, row in decorated], True)
 
 
-def render_required_headers(has_bearer: bool, has_json_body: bool) -> str:
-    headers = []
+def render_required_headers(buf: TextIO, has_bearer: bool, has_json_body: bool) -> None:
+    buf.write("\n### Required headers\n\n")
+    if not (has_bearer or has_json_body):
+        buf.write("None.\n")
     if has_bearer:
-        headers.append("`Authorization: Bearer <token>`")
+        buf.write("- `Authorization: Bearer <token>`\n")
     if has_json_body:
-        headers.append("`Content-Type: application/json`")
-
-    out = []
-    out.append(md_h3("Required headers"))
-    if headers:
-        for h in headers:
-            out.append(f"- {h}")
-    else:
-        out.append("None.")
-    out.append("")
-    return "\n".join(out)
+        buf.write("- `Content-Type: application/json`\n")
+    buf.write("\n")
 
 
-def render_request_body_fields(fields: List[Dict[str, str]], has_json_body: bool) -> str:
-    out = []
-    out.append(md_h3("Request body fields"))
+def render_request_body_fields(buf: TextIO, fields: List[Dict[str, str]], has_json_body: bool) -> None:
+    buf.write("\n### Request body fields\n\n")
     if not has_json_body:
-        out.append("This endpoint does not define a request body.")
-        out.append("")
-        return "\n".join(out)
+        buf.write("This endpoint does not define a request body.\n\n")
+        return
 
     if not fields:
-        out.append("Request body schema is JSON, but fields are not expanded in this MVP.")
-        out.append("")
-        return "\n".join(out)
+        buf.write("Request body schema is JSON, but fields are not expanded in this MVP.\n\n")
+        return
 
-    out.append("| Field | Type | Required | Notes |")
-    out.append("|---|---|:---:|---|")
+    buf.write("| Field | Type | Required | Notes |\n")
+    buf.write("|---|---|:---:|---|\n")
+    # rows come from extract_request_fields: every key is present and notes are escaped
+    write = buf.write
     for f in fields:
-        name = f.get("name", "")
-        ftype = f.get("type", "")
-        req = f.get("required", "")
-        notes = md_escape(f.get("notes", ""))
-        out.append(f"| `{name}` | {ftype} | {req} | {notes} |")
-    out.append("")
-    return "\n".join(out)
+        write(f"| `{f['name']}` | {f['type']} | {f['required']} | {f['notes']} |\n")
+    buf.write("\n")
 
 
-def render_responses(op: Dict[str, Any]) -> str:
-    out = []
-    out.append(md_h3("Responses"))
+def render_responses(
+    buf: TextIO,
+    op: Dict[str, Any],
+    spec: Optional[Dict[str, Any]] = None,
+    example_memo: Optional[Dict[int, Any]] = None,
+    ref_cache: Optional[Dict[str, Any]] = None,
+) -> None:
+    buf.write("\n### Responses\n\n")
 
     responses = op.get("responses") or {}
     if not isinstance(responses, dict) or not responses:
-        out.append("No responses defined.")
-        out.append("")
-        return "\n".join(out)
-
-    # sort codes: numeric-ish first
-    def sort_key(code: str) -> Tuple[int, str]:
-        try:
-            return (0, f"{int(code):04d}")
-        except Exception:
-            return (1, code)
-
-    for code in sorted(responses.keys(), key=sort_key):
-        r = responses.get(code)
+        buf.write("No responses defined.\n\n")
+        return
+
+    # sort codes: numeric first, then "default"/"2XX"-style keys; decorate once
+    # instead of trying int() per key. YAML may hand us int keys, hence str().
+    decorated = []
+    for i, code in enumerate(responses):
+        c = str(code)
+        decorated.append(((0, int(c), "") if c.isdecimal() else (1, 0, c), i, code))
+    decorated.sort()
+
+    for _, _, code in decorated:
+        r = resolve_ref(spec, responses[code], ref_cache)
         if not isinstance(r, dict):
             continue
         desc = md_escape(str(r.get("description") or ""))
-        out.append(f"**{code}** — {desc}" if desc else f"**{code}**")
+        buf.write(f"**{code}** — {desc}\n" if desc else f"**{code}**\n")
 
         content = r.get("content") or {}
-        ex = extract_json_example(content) if isinstance(content, dict) else None
+        ex = extract_json_example(content, example_memo) if isinstance(content, dict) else None
         if ex is not None:
-            out.append("")
-            out.append("```json")
-            out.append(json.dumps(ex, ensure_ascii=False, indent=2))
-            out.append("```")
-        out.append("")
+            buf.write("\n```json\n")
+            buf.write(_json_dumps(ex))
+            buf.write("\n```\n")
+        buf.write("\n")
+
+
+def render_endpoint_section(
+    buf: TextIO,
+    method: str,
+    path: str,
+    op: Dict[str, Any],
+    has_bearer: bool,
+    spec: Optional[Dict[str, Any]] = None,
+    example_memo: Optional[Dict[int, Any]] = None,
+    ref_cache: Optional[Dict[str, Any]] = None,
+) -> None:
+    buf.write(f"\n## {method} {path}\n\n")
+
+    desc = op.get("description") or op.get("summary")
+    if desc:
+        buf.write(md_escape(str(desc)))
+        buf.write("\n\n")
+
+    fields, has_json_body = extract_request_fields(op, spec, ref_cache)
+    render_required_headers(buf, has_bearer, has_json_body)
+    render_request_body_fields(buf, fields, has_json_body)
+    render_responses(buf, op, spec, example_memo, ref_cache)
+
+
+def _iter_blocks(spec: Dict[str, Any]) -> Iterator[str]:
+    view = _validate(spec)
+    title = view["info"].get("title") or "API reference"
+
+    methods, paths, ops, purposes = collect_operations(view)
+    base_url = first_server_url(view)
+    has_bearer = detect_bearer_auth(view)
+
+    buf = io.StringIO()
+    buf.write(f"# {title} — reference\n\n")
+    buf.write("This page is a human-readable reference generated from an OpenAPI spec.\n\n")
 
-    return "\n".join(out)
+    if base_url:
+        buf.write(f"**Base URL:** `{base_url}`\n\n")
 
+    if ops:
+        render_endpoint_summary(buf, methods, paths, purposes)
+    else:
+        buf.write("No operations found in `paths`.\n\n")
 
-def render_endpoint_sections(ops: List[Tuple[str, str, Dict[str, Any]]], has_bearer: bool) -> str:
-    out = []
-    for method, path, op in ops:
-        title = f"{method} {path}"
-        out.append(md_h2(title))
+    render_auth_section(buf, has_bearer)
+    yield buf.getvalue()
 
-        desc = op.get("description") or op.get("summary")
-        if desc:
-            out.append(md_escape(str(desc)))
-            out.append("")
+    # scoped to this render: a later call on a mutated spec sees fresh data
+    example_memo: Dict[int, Any] = {}
+    ref_cache: Dict[str, Any] = {}
+    for method, path, op in zip(methods, paths, ops):
+        buf = io.StringIO()
+        render_endpoint_section(buf, method, path, op, has_bearer, spec, example_memo, ref_cache)
+        yield buf.getvalue()
 
-        fields, has_json_body = extract_request_fields(op)
-        out.append(render_required_headers(has_bearer, has_json_body))
-        out.append(render_request_body_fields(fields, has_json_body))
-        out.append(render_responses(op))
 
-    return "\n".join(out).rstrip() + "\n"
+def iter_markdown(spec: Dict[str, Any]) -> Iterator[str]:
+    """
+    Yields the reference in chunks: the header/summary/auth block first, then
+    one chunk per endpoint, so only one section is held in memory at a time.
+    """
+    # Every block ends with its own blank line and contains non-blank text, so
+    # trimming the last chunk matches stripping the whole document.
+    pending = None
+    for chunk in _iter_blocks(spec):
+        if pending is not None:
+            yield pending
+        pending = chunk
+    if pending is not None:
+        yield pending.rstrip() + "\n"
 
 
 def build_markdown(spec: Dict[str, Any]) -> str:
-    title = (spec.get("info") or {}).get("title") if isinstance(spec.get("info"), dict) else None
-    if not title:
-        title = "API reference"
+    return "".join(iter_markdown(spec))
 
-    ops = collect_operations(spec)
-    base_url = first_server_url(spec)
-    has_bearer = detect_bearer_auth(spec)
 
-    out: List[str] = []
-    out.append(md_h1(f"{title} — reference").rstrip() + "\n")
-    out.append("This page is a human-readable reference generated from an OpenAPI spec.\n")
+def cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "openapi_to_human")
 
-    if base_url:
-        out.append(f"**Base URL:** `{base_url}`\n")
 
-    if ops:
-        out.append(render_endpoint_summary(ops))
-    else:
-        out.append("No operations found in `paths`.\n")
+# Entries kept in the cache directory; older ones (by last use) are pruned.
+CACHE_MAX_ENTRIES = 64
 
-    out.append(render_auth_section(has_bearer))
 
-    if ops:
-        out.append(render_endpoint_sections(ops, has_bearer))
+def prune_cache(d: str, keep: str) -> None:
+    """
+    Drops entries for the same content under another mtime (re-saves of an
+    unchanged spec), then the least recently used entries beyond
+    CACHE_MAX_ENTRIES. Never removes `keep`.
+    """
+    digest = keep.split("-", 1)[0]
+    entries = []
+    with os.scandir(d) as it:
+        for e in it:
+            if not e.name.endswith(".md") or e.name == keep + ".md":
+                continue
+            try:
+                if e.name.startswith(digest + "-"):
+                    os.unlink(e.path)
+                else:
+                    entries.append((e.stat().st_mtime_ns, e.path))
+            except FileNotFoundError:
+                pass  # removed by a concurrent run
+    entries.sort(reverse=True)
+    for _, path in entries[CACHE_MAX_ENTRIES - 1 :]:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def cache_key(path: str) -> Optional[str]:
+    """
+    Key for the rendered Markdown of a spec: content hash + mtime of the spec,
+    plus the mtime of this script so a changed renderer never serves stale output.
+    Returns None for pipes and other non-regular files, which can only be read once.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        if st.st_size:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                h.update(mm)
+            finally:
+                mm.close()
+    h.update(str(os.stat(__file__).st_mtime_ns).encode("ascii"))
+    return f"{h.hexdigest()}-{st.st_mtime_ns}"
+
+
+def _replace_safe(out: Path, target: str) -> bool:
+    """
+    True if out (resolved to target) can be swapped for a new file without
+    anyone noticing: it does not exist yet, or it is a plain file we own, with
+    no other hard links, in a directory we can write to. Devices, FIFOs,
+    shared files etc. must be written through instead.
+    """
+    try:
+        # stat out, not target: /dev/stdout resolves to a /proc magic link
+        # that realpath cannot turn into a real path
+        st = os.stat(out)
+    except FileNotFoundError:
+        return True
+    return (
+        stat.S_ISREG(st.st_mode)
+        and st.st_nlink == 1
+        and (not hasattr(os, "geteuid") or st.st_uid == os.geteuid())  # no uids on Windows
+        and os.access(os.path.dirname(target), os.W_OK)
+    )
 
-    return "\n".join(out).strip() + "\n"
+
+@contextlib.contextmanager
+def atomic_output(out: Path) -> Iterator[str]:
+    """
+    Yields the path to write the output to. For ordinary files that is a temp
+    file next to the (symlink-resolved) target, which replaces it only if the
+    block completes, so a failed render never truncates an existing file.
+    Anything else (/dev/stdout, FIFOs, hard-linked or foreign-owned files) gets
+    the target itself, written through as before. Missing parent directories
+    are created here, i.e. only once there is output.
+    """
+    if out.parent != Path("."):  # a bare file name needs no mkdir
+        out.parent.mkdir(parents=True, exist_ok=True)
+    target = os.path.realpath(out)
+    if not _replace_safe(out, target):
+        yield str(out)
+        return
+
+    d, name = os.path.split(target)
+    fd, tmp = tempfile.mkstemp(dir=d, prefix=f".{name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp
+        # mkstemp creates 0600; keep the old file's mode or what open() would give
+        try:
+            mode = stat.S_IMODE(os.stat(target).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp, mode)
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def copy_cached_markdown(key: str, out: Optional[Path]) -> bool:
+    """
+    Serves a cache hit by copying the stored file straight to the destination
+    (sendfile where the OS has it); nothing is parsed, rendered or decoded.
+    Returns False on a cache miss.
+    """
+    cached = os.path.join(cache_dir(), key + ".md")
+    try:
+        os.utime(cached)  # mark as recently used for prune_cache
+    except FileNotFoundError:
+        return False
+    except OSError:
+        pass  # read-only cache still serves hits
+
+    try:
+        if out is not None:
+            with atomic_output(out) as dst:
+                if os.path.isfile(dst):
+                    shutil.copyfile(cached, dst)
+                else:  # copyfile refuses FIFOs
+                    with open(cached, "rb") as src, open(dst, "wb") as f:
+                        shutil.copyfileobj(src, f)
+            return True
+
+        stdout = getattr(sys.stdout, "buffer", None)
+        if stdout is None:  # stdout replaced by a text-only stream
+            with open(cached, "r", encoding="utf-8") as src:
+                sys.stdout.write(src.read())
+            return True
+
+        with open(cached, "rb") as src:
+            sys.stdout.flush()
+            shutil.copyfileobj(src, stdout)
+            stdout.flush()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def tee_to_cache(key: str, chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Passes chunks through while writing them to the cache; the entry only
+    appears (atomically) once every chunk was produced. Best effort: an
+    unwritable cache never fails the run.
+    """
+    d = cache_dir()
+    try:
+        os.makedirs(d, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=d, suffix=".tmp")
+        f: Optional[TextIO] = os.fdopen(fd, "w", encoding="utf-8")
+    except OSError as ex:
+        eprint(f"WARNING: could not write cache: {ex}")
+        yield from chunks
+        return
+
+    try:
+        for chunk in chunks:
+            if f is not None:
+                try:
+                    f.write(chunk)
+                except OSError as ex:
+                    eprint(f"WARNING: could not write cache: {ex}")
+                    f.close()
+                    f = None
+            yield chunk
+        if f is not None:
+            f.close()
+            f = None
+            os.replace(tmp, os.path.join(d, key + ".md"))
+            prune_cache(d, key)
+    except OSError as ex:
+        eprint(f"WARNING: could not write cache: {ex}")
+    finally:
+        if f is not None:
+            f.close()
+        if os.path.exists(tmp):
+            os.unlink(tmp)
 
 
 def parse_args(argv: List[str]) -> argparse.Namespace:
@@ -353,26 +770,39 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
         help="Output markdown file path. If omitted, prints to stdout.",
         default=None,
     )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-render instead of reusing output cached in ~/.cache/openapi_to_human.",
+    )
     return p.parse_args(argv)
 
 
 def main(argv: List[str]) -> int:
     args = parse_args(argv)
     try:
-        spec = load_spec(args.input)
-        md = build_markdown(spec)
+        out = Path(args.output) if args.output else None
+
+        key = None if args.no_cache or not os.path.exists(args.input) else cache_key(args.input)
+        if not (key and copy_cached_markdown(key, out)):
+            spec = load_spec(args.input)
+            chunks = iter_markdown(spec)
+            if key:
+                chunks = tee_to_cache(key, chunks)
+
+            if out is not None:
+                with atomic_output(out) as dst, open(dst, "w", encoding="utf-8") as f:
+                    for chunk in chunks:
+                        f.write(chunk)
+            else:
+                for chunk in chunks:
+                    sys.stdout.write(chunk)
     except Exception as ex:
         eprint(f"ERROR: {ex}")
         return 1
 
-    if args.output:
-        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(md)
+    if out is not None:
         print(f"Wrote: {args.output}")
-    else:
-        print(md, end="")
-
     return 0
 
 